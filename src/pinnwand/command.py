@@ -76,7 +76,7 @@ def add(lexer: str) -> None:
     """Add a paste to pinnwand's database from stdin."""
     from pinnwand import utility
 
-    if lexer not in utility.list_languages():
+    if lexer not in utility.available_languages():
         log.error("add: unknown lexer")
         return
 
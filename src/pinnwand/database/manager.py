@@ -1,34 +1,89 @@
 import contextlib
+import threading
+from typing import Any
 
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, event, make_url, Engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import StaticPool
 
 
 from pinnwand.configuration import Configuration, ConfigurationProvider
 
 
+def _sqlite_on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    """Use write-ahead logging for SQLite databases. This lets readers
+    continue while a paste is being written and only needs to sync the log
+    at checkpoints instead of on every commit."""
+
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 class DatabaseManager:
     """An entity responsible for managing database-related resources."""
 
     _engine: Engine = None
     _session_maker = None
+    _shared_connection = False
+    _lock = threading.Lock()
 
     @classmethod
     def get_engine(cls):
         """Return an engine for the currently configured connection string."""
-        configuration: Configuration = ConfigurationProvider.get_config()
         if not cls._engine:
-            cls._engine = create_engine(configuration.database_uri)
+            with cls._lock:
+                if not cls._engine:
+                    cls._engine = cls._create_engine()
 
         return cls._engine
 
+    @classmethod
+    def _create_engine(cls) -> Engine:
+        configuration: Configuration = ConfigurationProvider.get_config()
+        url = make_url(configuration.database_uri)
+
+        if url.get_backend_name() == "sqlite" and url.database in (
+            None,
+            "",
+            ":memory:",
+        ):
+            # An in-memory SQLite database only exists within a single
+            # connection so every session has to share that one connection.
+            # Sessions must then never overlap, see `has_shared_connection`.
+            cls._shared_connection = True
+            return create_engine(
+                url,
+                poolclass=StaticPool,
+                connect_args={"check_same_thread": False},
+            )
+
+        engine = create_engine(url)
+
+        if url.get_backend_name() == "sqlite":
+            event.listen(engine, "connect", _sqlite_on_connect)
+
+        return engine
+
+    @classmethod
+    def has_shared_connection(cls) -> bool:
+        """Return if all sessions use one and the same connection, in which
+        case they can't be used concurrently from multiple threads."""
+        cls.get_engine()
+        return cls._shared_connection
+
     @classmethod
     @contextlib.contextmanager
     def get_session(cls) -> Session:
         """Create a self-disposable database session."""
         if not cls._session_maker:
-            cls._session_maker = sessionmaker(bind=cls.get_engine())
+            engine = cls.get_engine()
+
+            with cls._lock:
+                if not cls._session_maker:
+                    cls._session_maker = sessionmaker(bind=engine)
 
         new_session = cls._session_maker()
         try:
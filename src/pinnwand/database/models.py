@@ -1,4 +1,5 @@
 import datetime
+import functools
 from datetime import timedelta, timezone
 from typing import Optional
 
@@ -10,11 +11,17 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    bindparam,
+    delete,
+    select,
 )
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import (
+    Session,
+    contains_eager,
     declarative_base,
     relationship,
+    selectinload,
 )
 
 from sqlalchemy_utc import UtcDateTime
@@ -78,9 +85,65 @@ class Paste(Base):  # type: ignore
     def __repr__(self) -> str:
         return f"<Paste(slug={self.slug})>"
 
+    @classmethod
+    def get_if_live(
+        cls,
+        session: Session,
+        slug: str,
+        now: Optional[datetime.datetime] = None,
+    ) -> Optional["Paste"]:
+        """Fetch a paste by its slug unless it has expired at `now`, which
+        defaults to the current time. Expired pastes are left alone here, they
+        are removed by the periodic reaping job.
+
+        The paste's files are loaded along with it so the paste can still be
+        used after its session has been closed."""
+
+        if now is None:
+            now = datetime.datetime.now(timezone.utc)
+
+        return session.execute(
+            _LIVE_PASTE_BY_SLUG, {"slug": slug, "now": now}
+        ).scalar_one_or_none()
+
+    @classmethod
+    def delete_if_live(
+        cls,
+        session: Session,
+        removal: str,
+        now: Optional[datetime.datetime] = None,
+    ) -> bool:
+        """Delete the paste with the given removal id, and its files, unless it
+        has expired. Returns whether a paste was deleted.
+
+        This issues the deletes directly instead of loading the paste and
+        letting the ORM cascade to its files."""
+
+        if now is None:
+            now = datetime.datetime.now(timezone.utc)
+
+        live = (
+            cls.removal == removal,
+            cls.exp_date >= now,
+        )
+
+        session.execute(
+            delete(File)
+            .where(File.paste_id.in_(select(cls.id).where(*live)))
+            .execution_options(synchronize_session=False)
+        )
+
+        result = session.execute(
+            delete(cls)
+            .where(*live)
+            .execution_options(synchronize_session=False)
+        )
+
+        return bool(result.rowcount)  # type: ignore
+
 
 class File(Base):  # type: ignore
-    paste_id = Column(ForeignKey("paste.id"))
+    paste_id = Column(ForeignKey("paste.id"), index=True)
     slug = Column(String(255), unique=True)
 
     pub_date = Column(UtcDateTime)
@@ -145,3 +208,48 @@ class File(Base):  # type: ignore
     @property
     def pretty_size(self) -> str:
         return utility.size_postfix(len(self.raw))
+
+    @functools.cached_property
+    def raw_utf8(self) -> bytes:
+        """The raw text encoded as UTF-8, as it is sent to clients. Files are
+        never changed after creation so this is only encoded once."""
+        return str(self.raw).encode("utf-8")
+
+    @classmethod
+    def get_if_live(
+        cls,
+        session: Session,
+        slug: str,
+        now: Optional[datetime.datetime] = None,
+    ) -> Optional["File"]:
+        """Fetch a file by its slug unless the paste it belongs to has
+        expired at `now`. The paste is loaded from the same query."""
+
+        if now is None:
+            now = datetime.datetime.now(timezone.utc)
+
+        return session.execute(
+            _LIVE_FILE_BY_SLUG, {"slug": slug, "now": now}
+        ).scalar_one_or_none()
+
+
+# The lookups done on every page view are constructed only once, SQLAlchemy
+# then reuses their compiled form from its cache and only binds parameters.
+_LIVE_PASTE_BY_SLUG = (
+    select(Paste)
+    .options(selectinload(Paste.files))
+    .where(
+        Paste.slug == bindparam("slug"),
+        Paste.exp_date >= bindparam("now"),
+    )
+)
+
+_LIVE_FILE_BY_SLUG = (
+    select(File)
+    .join(File.paste)
+    .options(contains_eager(File.paste))
+    .where(
+        File.slug == bindparam("slug"),
+        Paste.exp_date >= bindparam("now"),
+    )
+)
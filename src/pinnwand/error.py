@@ -1,3 +1,6 @@
+from typing import Dict, Type
+
+
 class ValidationError(ValueError):
     """This exception is used to indicate that a certain request is lacking or
     has unacceptable data aboard."""
@@ -17,3 +20,11 @@ class SpamError(ValueError):
     spamscore."""
 
     pass
+
+
+# The HTTP status codes that the website responds with for our exceptions.
+STATUS_CODES: Dict[Type[Exception], int] = {
+    ValidationError: 400,
+    RatelimitError: 429,
+    SpamError: 451,
+}
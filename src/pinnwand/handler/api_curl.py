@@ -38,7 +38,7 @@ class Create(tornado.web.RequestHandler):
 
         self.set_header("Content-Type", "text/plain")
 
-        if lexer not in utility.list_languages():
+        if lexer not in utility.available_languages():
             log.info(
                 "CurlCreate.post: a paste was submitted with an invalid lexer"
             )
@@ -1,5 +1,5 @@
 import json
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 from typing import Any
 from urllib.parse import urljoin
 
@@ -24,46 +24,25 @@ class Base(tornado.web.RequestHandler):
 
     def write_error(self, status_code: int, **kwargs: Any) -> None:
         if status_code == 404:
-            self.render(
-                "error.html",
-                text="That page does not exist",
-                status_code=404,
-                pagetitle="error",
-            )
+            text = "That page does not exist"
         else:
             type_, exc, traceback = kwargs["exc_info"]
 
-            if type_ == error.ValidationError:
-                self.set_status(400)
-                self.render(
-                    "error.html",
-                    text=str(exc),
-                    status_code=400,
-                    pagetitle="error",
-                )
-            elif type_ == error.RatelimitError:
-                self.set_status(429)
-                self.render(
-                    "error.html",
-                    text=str(exc),
-                    status_code=429,
-                    pagetitle="error",
-                )
-            elif type_ == error.SpamError:
-                self.set_status(451)
-                self.render(
-                    "error.html",
-                    text=str(exc),
-                    status_code=429,
-                    pagetitle="error",
-                )
+            if type_ in error.STATUS_CODES:
+                status_code = error.STATUS_CODES[type_]
+                text = str(exc)
+
+                self.set_status(status_code)
             else:
-                self.render(
-                    "error.html",
-                    text="unknown error",
-                    status_code=500,
-                    pagetitle="error",
-                )
+                status_code = 500
+                text = "unknown error"
+
+        self.render(
+            "error.html",
+            text=text,
+            status_code=status_code,
+            pagetitle="error",
+        )
 
     async def get(self) -> None:
         raise tornado.web.HTTPError(404)
@@ -78,25 +57,11 @@ class Show(Base):
     @defensive.ratelimit(area="read")
     async def get(self, slug: str) -> None:  # type: ignore
         with manager.DatabaseManager.get_session() as session:
-            paste = (
-                session.query(models.Paste)
-                .filter(models.Paste.slug == slug)
-                .first()
-            )
+            paste = models.Paste.get_if_live(session, slug)
 
             if not paste:
                 raise tornado.web.HTTPError(404)
 
-            if paste.exp_date < datetime.now(timezone.utc):
-                session.delete(paste)
-                session.commit()
-
-                log.warning(
-                    "Show.get: paste was expired, is your cronjob running?"
-                )
-
-                raise tornado.web.HTTPError(404)
-
             self.write(
                 {
                     "paste_id": paste.slug,
@@ -132,7 +97,7 @@ class Create(Base):
             log.info("APINew.post: a paste was submitted without content")
             raise tornado.web.HTTPError(400)
 
-        if lexer not in utility.list_languages():
+        if lexer not in utility.available_languages():
             log.info("APINew.post: a paste was submitted with an invalid lexer")
             raise tornado.web.HTTPError(400)
 
@@ -1,5 +1,5 @@
 import json
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 from typing import Any
 from urllib.parse import urljoin
 
@@ -75,12 +75,12 @@ class Paste(Base):
                 "v1-api",
             )
 
-            for file in files:
+            for index, file in enumerate(files):
                 lexer = file.get("lexer", "")
                 content = file.get("content")
                 filename = file.get("name")
 
-                if lexer not in utility.list_languages():
+                if lexer not in utility.available_languages():
                     raise tornado.web.HTTPError(400, "invalid lexer")
 
                 if not content:
@@ -89,7 +89,8 @@ class Paste(Base):
                 try:
                     paste.files.append(
                         models.File(
-                            next(slug_context),
+                            # The first file shares its slug with the paste
+                            paste.slug if index == 0 else next(slug_context),
                             content,
                             lexer,
                             filename,
@@ -105,8 +106,6 @@ class Paste(Base):
                     400, "invalid content (exceeds size limit)"
                 )
 
-            paste.files[0].slug = paste.slug
-
             session.add(paste)
 
             try:
@@ -127,25 +126,11 @@ class PasteDetail(Base):
     @defensive.ratelimit(area="read")
     async def get(self, slug: str) -> None:
         with manager.DatabaseManager.get_session() as session:
-            paste = (
-                session.query(models.Paste)
-                .filter(models.Paste.slug == slug)
-                .first()
-            )
+            paste = models.Paste.get_if_live(session, slug)
 
             if not paste:
                 raise tornado.web.HTTPError(404)
 
-            if paste.exp_date < datetime.now(timezone.utc):
-                session.delete(paste)
-                session.commit()
-
-                log.warning(
-                    "Show.get: paste was expired, is your cronjob running?"
-                )
-
-                raise tornado.web.HTTPError(404)
-
             self.write(
                 {
                     "files": [
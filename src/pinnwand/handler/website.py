@@ -1,10 +1,18 @@
 import binascii
-import io
+import concurrent.futures
+import functools
+import os
 import zipfile
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
 import docutils.core
+import docutils.io
+import docutils.parsers.rst
+import docutils.readers.standalone
+import docutils.writers.html4css1
+import sqlalchemy
+import tornado.ioloop
 import tornado.web
 
 from pinnwand import (
@@ -19,6 +27,66 @@ from pinnwand.database import manager, models
 
 log = logger.get_logger(__name__)
 
+HEX_CHUNK_SIZE = 64 * 1024  # in bytes
+ARCHIVE_COMPRESS_SIZE = 16 * 1024  # in bytes
+
+
+# The database layer is synchronous, handlers run their queries on this pool
+# so they don't block the IOLoop. It is sized like SQLAlchemy's default
+# connection pool.
+_db_pool = concurrent.futures.ThreadPoolExecutor(max_workers=5)
+
+T = TypeVar("T")
+
+
+async def _run_in_db_pool(func: Callable[..., T], *args: Any) -> T:
+    # When all sessions share a single connection (an in-memory SQLite
+    # database) they have to stay on the IOLoop like all other database
+    # access, otherwise they would interleave on that connection.
+    if manager.DatabaseManager.has_shared_connection():
+        return func(*args)
+
+    return await tornado.ioloop.IOLoop.current().run_in_executor(
+        _db_pool, func, *args
+    )
+
+
+def _get_live_paste(slug: str, now: datetime) -> Optional[models.Paste]:
+    with manager.DatabaseManager.get_session() as session:
+        return models.Paste.get_if_live(session, slug, now)
+
+
+def _get_live_file(slug: str, now: datetime) -> Optional[models.File]:
+    with manager.DatabaseManager.get_session() as session:
+        return models.File.get_if_live(session, slug, now)
+
+
+def _remove_live_paste(removal: str, now: datetime) -> bool:
+    """Remove the live paste with the given removal id, returns if there was
+    such a paste."""
+
+    with manager.DatabaseManager.get_session() as session:
+        removed = models.Paste.delete_if_live(session, removal, now)
+        session.commit()
+
+        return removed
+
+
+class _ResponseWriter:
+    """A minimal write-only file-like object that passes everything written
+    to it on to a request handler. This allows `zipfile` to write archives
+    directly into a response."""
+
+    def __init__(self, handler: tornado.web.RequestHandler) -> None:
+        self._handler = handler
+
+    def write(self, data: bytes) -> int:
+        self._handler.write(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
 
 class Base(tornado.web.RequestHandler):
     """Base page for all 'web' pages to inherit from. This page handles
@@ -28,48 +96,33 @@ class Base(tornado.web.RequestHandler):
     It automatically converts ValidationError to a 400 error page but leaves
     other HTTPErrors alone."""
 
+    def prepare(self) -> None:
+        self.configuration: Configuration = ConfigurationProvider.get_config()
+
+        # The time this request is handled at, for expiry checks
+        self._now = datetime.now(timezone.utc)
+
     def write_error(self, status_code: int, **kwargs: Any) -> None:
         if status_code == 404:
-            self.render(
-                "error.html",
-                text="That page does not exist",
-                status_code=404,
-                pagetitle="error",
-            )
+            text = "That page does not exist"
         else:
             type_, exc, traceback = kwargs["exc_info"]
 
-            if type_ == error.ValidationError:
-                self.set_status(400)
-                self.render(
-                    "error.html",
-                    text=str(exc),
-                    status_code=400,
-                    pagetitle="error",
-                )
-            elif type_ == error.RatelimitError:
-                self.set_status(429)
-                self.render(
-                    "error.html",
-                    text=str(exc),
-                    status_code=429,
-                    pagetitle="error",
-                )
-            elif type_ == error.SpamError:
-                self.set_status(451)
-                self.render(
-                    "error.html",
-                    text=str(exc),
-                    status_code=429,
-                    pagetitle="error",
-                )
+            if type_ in error.STATUS_CODES:
+                status_code = error.STATUS_CODES[type_]
+                text = str(exc)
+
+                self.set_status(status_code)
             else:
-                self.render(
-                    "error.html",
-                    text="unknown error",
-                    status_code=500,
-                    pagetitle="error",
-                )
+                status_code = 500
+                text = "unknown error"
+
+        self.render(
+            "error.html",
+            text=text,
+            status_code=status_code,
+            pagetitle="error",
+        )
 
     async def get(self) -> None:
         raise tornado.web.HTTPError(404)
@@ -87,26 +140,23 @@ class Create(Base):
         """Render the new paste form, optionally have a lexer preselected from
         the URL."""
 
-        configuration: Configuration = ConfigurationProvider.get_config()
-
-        lexers_available = utility.list_languages()
         lexers_selected = [
             lexer for lexer in lexers.split("+") if lexer.strip()
         ]
 
         if not lexers_selected:
-            lexers_selected = [configuration.default_selected_lexer]
+            lexers_selected = [self.configuration.default_selected_lexer]
 
         # Make sure all lexers are available
-        if not all(lexer in lexers_available for lexer in lexers_selected):
+        if not utility.available_languages().issuperset(lexers_selected):
             log.debug("CreatePaste.get: non-existent lexer requested")
             raise tornado.web.HTTPError(404)
 
         await self.render(
             "create.html",
-            expiries=configuration.expiries,
+            expiries=self.configuration.expiries,
             lexers=lexers_selected,
-            lexers_available=lexers_available,
+            lexers_available=utility.list_languages(),
             pagetitle="Create new paste",
             message=None,
             paste=None,
@@ -126,9 +176,8 @@ class Create(Base):
         lexer = self.get_body_argument("lexer")
         raw = self.get_body_argument("code", strip=False)
         expiry = self.get_body_argument("expiry")
-        configuration: Configuration = ConfigurationProvider.get_config()
 
-        if lexer not in utility.list_languages():
+        if lexer not in utility.available_languages():
             log.info("Paste.post: a paste was submitted with an invalid lexer")
             raise tornado.web.HTTPError(400)
 
@@ -136,13 +185,13 @@ class Create(Base):
         if not raw or not raw.strip():
             return self.redirect(f"/+{lexer}")
 
-        if expiry not in configuration.expiries:
+        if expiry not in self.configuration.expiries:
             log.info("Paste.post: a paste was submitted with an invalid expiry")
             raise tornado.web.HTTPError(400)
 
         paste = models.Paste(
             utility.slug_create(),
-            configuration.expiries[expiry],
+            self.configuration.expiries[expiry],
             "deprecated-web",
         )
         file = models.File(paste.slug, raw, lexer)
@@ -178,10 +227,9 @@ class CreateAction(Base):
     def post(self) -> None:  # type: ignore
         """POST handler for the 'web' side of things."""
 
-        configuration: Configuration = ConfigurationProvider.get_config()
         expiry = self.get_body_argument("expiry")
 
-        if expiry not in configuration.expiries:
+        if expiry not in self.configuration.expiries:
             log.info(
                 "CreateAction.post: a paste was submitted with an invalid expiry"
             )
@@ -189,61 +237,93 @@ class CreateAction(Base):
 
         auto_scale = self.get_body_argument("long", None) is None
 
-        lexers = self.get_body_arguments("lexer")
-        raws = self.get_body_arguments("raw", strip=False)
-        filenames = self.get_body_arguments("filename")
+        # Check the shape of the still undecoded arguments first, so we don't
+        # decode (possibly large) raws for requests we would refuse anyway
+        arguments = self.request.body_arguments
+
+        count_lexers = len(arguments.get("lexer", ()))
+        count_raws = len(arguments.get("raw", ()))
+        count_filenames = len(arguments.get("filename", ()))
 
-        if not all([lexers, raws, filenames]):
+        if not count_lexers or not count_raws or not count_filenames:
             # Prevent empty argument lists from making it through
             raise error.ValidationError(
                 "'lexers', 'raws', and 'filenames' arguments must not be empty"
             )
 
-        if not all(raw.strip() for raw in raws):
-            # Prevent empty raws from making it through
-            raise error.ValidationError("Empty pastes are not allowed")
-
-        if any(len(L) != len(lexers) for L in [lexers, raws, filenames]):
+        if not count_lexers == count_raws == count_filenames:
             log.info("CreateAction.post: mismatching argument lists")
             raise error.ValidationError(
                 "'lexers', 'raws', and 'filenames' arguments must be the same length"
             )
 
-        if any(lexer not in utility.list_languages() for lexer in lexers):
+        lexers = self.get_body_arguments("lexer")
+
+        if not utility.available_languages().issuperset(lexers):
             log.info("CreateAction.post: a file had an invalid lexer")
             raise error.ValidationError("Invalid lexer provided")
 
+        raws = self.get_body_arguments("raw", strip=False)
+        filenames = self.get_body_arguments("filename")
+
+        if not all(raw.strip() for raw in raws):
+            # Prevent empty raws from making it through
+            raise error.ValidationError("Empty pastes are not allowed")
+
         with manager.DatabaseManager.get_session() as session, utility.SlugContext(
             auto_scale
         ) as slug_context:
             paste = models.Paste(
-                next(slug_context), configuration.expiries[expiry], "web"
+                next(slug_context), self.configuration.expiries[expiry], "web"
             )
 
-            for lexer, raw, filename in zip(lexers, raws, filenames):
-                paste.files.append(
-                    models.File(
-                        next(slug_context),
-                        raw,
-                        lexer,
-                        filename if filename else None,
-                    )
+            # For the first file we will always use the same slug as the paste,
+            # since slugs are generated to be unique over both pastes and files
+            # this can be done safely.
+            files = [
+                models.File(
+                    paste.slug if index == 0 else next(slug_context),
+                    raw,
+                    lexer,
+                    filename if filename else None,
                 )
+                for index, (lexer, raw, filename) in enumerate(
+                    zip(lexers, raws, filenames)
+                )
+            ]
 
-            total_size = sum(len(f.fmt) for f in paste.files)
-            if total_size > configuration.paste_size:
+            total_size = sum(len(f.fmt) for f in files)
+            if total_size > self.configuration.paste_size:
                 log.info("CreateAction.post: sum of files was too large")
                 raise error.ValidationError(
                     "Sum of file sizes exceeds size limit when syntax highlighting applied "
-                    f"({total_size//1024}kB > {configuration.paste_size//1024}kB)"
+                    f"({total_size//1024}kB > {self.configuration.paste_size//1024}kB)"
                 )
 
-            # For the first file we will always use the same slug as the paste,
-            # since slugs are generated to be unique over both pastes and files
-            # this can be done safely.
-            paste.files[0].slug = paste.slug
-
             session.add(paste)
+            session.flush()
+
+            # The ORM inserts files one by one to fetch their primary keys,
+            # which we don't need, so insert them all in one go instead. The
+            # files are deliberately not added to `paste.files`, the paste is
+            # expired on commit so its files get loaded from the database if
+            # they are ever needed.
+            session.execute(
+                sqlalchemy.insert(models.File),
+                [
+                    {
+                        "paste_id": paste.id,
+                        "slug": file.slug,
+                        "pub_date": file.pub_date,
+                        "chg_date": file.chg_date,
+                        "lexer": file.lexer,
+                        "raw": file.raw,
+                        "fmt": file.fmt,
+                        "filename": file.filename,
+                    }
+                    for file in files
+                ],
+            )
             session.commit()
 
             # The removal cookie is set for the specific path of the paste it is
@@ -265,29 +345,20 @@ class Repaste(Base):
         """Render the new paste form, optionally have a lexer preselected from
         the URL."""
 
-        configuration: Configuration = ConfigurationProvider.get_config()
+        paste = await _run_in_db_pool(_get_live_paste, slug, self._now)
 
-        with manager.DatabaseManager.get_session() as session:
-            paste = (
-                session.query(models.Paste)
-                .filter(models.Paste.slug == slug)
-                .first()
-            )
-
-            if not paste:
-                raise tornado.web.HTTPError(404)
-
-            lexers_available = utility.list_languages()
+        if not paste:
+            raise tornado.web.HTTPError(404)
 
-            await self.render(
-                "create.html",
-                expiries=configuration.expiries,
-                lexers=["text"],  # XXX make this majority of file lexers?
-                lexers_available=lexers_available,
-                pagetitle="repaste",
-                message=None,
-                paste=paste,
-            )
+        await self.render(
+            "create.html",
+            expiries=self.configuration.expiries,
+            lexers=["text"],  # XXX make this majority of file lexers?
+            lexers_available=utility.list_languages(),
+            pagetitle="repaste",
+            message=None,
+            paste=paste,
+        )
 
 
 class Show(Base):
@@ -297,35 +368,20 @@ class Show(Base):
     async def get(self, slug: str) -> None:  # type: ignore
         """Fetch paste from database by slug and render the paste."""
 
-        with manager.DatabaseManager.get_session() as session:
-            paste = (
-                session.query(models.Paste)
-                .filter(models.Paste.slug == slug)
-                .first()
-            )
-
-            if not paste:
-                raise tornado.web.HTTPError(404)
-
-            if paste.exp_date < datetime.now(timezone.utc):
-                session.delete(paste)
-                session.commit()
+        paste = await _run_in_db_pool(_get_live_paste, slug, self._now)
 
-                log.warning(
-                    "Show.get: paste was expired, is your cronjob running?"
-                )
-
-                raise tornado.web.HTTPError(404)
+        if not paste:
+            raise tornado.web.HTTPError(404)
 
-            can_delete = self.get_cookie("removal") == str(paste.removal)
+        can_delete = self.get_cookie("removal") == str(paste.removal)
 
-            self.render(
-                "show.html",
-                paste=paste,
-                pagetitle=f"View paste {paste.slug}",
-                can_delete=can_delete,
-                linenos=False,
-            )
+        self.render(
+            "show.html",
+            paste=paste,
+            pagetitle=f"View paste {paste.slug}",
+            can_delete=can_delete,
+            linenos=False,
+        )
 
 
 class RedirectShow(Base):
@@ -334,27 +390,12 @@ class RedirectShow(Base):
     async def get(self, slug: str) -> None:  # type: ignore
         """Fetch paste from database and redirect to /slug if the paste
         exists."""
-        with manager.DatabaseManager.get_session() as session:
-            paste = (
-                session.query(models.Paste)
-                .filter(models.Paste.slug == slug)
-                .first()
-            )
-
-            if not paste:
-                raise tornado.web.HTTPError(404)
+        paste = await _run_in_db_pool(_get_live_paste, slug, self._now)
 
-            if paste.exp_date < datetime.now(timezone.utc):
-                session.delete(paste)
-                session.commit()
-
-                log.warning(
-                    "RedirectShow.get: paste was expired, is your cronjob running?"
-                )
-
-                raise tornado.web.HTTPError(404)
+        if not paste:
+            raise tornado.web.HTTPError(404)
 
-            self.redirect(f"/{paste.slug}")
+        self.redirect(f"/{paste.slug}")
 
 
 class FileRaw(Base):
@@ -364,28 +405,13 @@ class FileRaw(Base):
     async def get(self, file_id: str) -> None:  # type: ignore
         """Get a file from the database and show it in the plain."""
 
-        with manager.DatabaseManager.get_session() as session:
-            file = (
-                session.query(models.File)
-                .filter(models.File.slug == file_id)
-                .first()
-            )
-
-            if not file:
-                raise tornado.web.HTTPError(404)
-
-            if file.paste.exp_date < datetime.now(timezone.utc):
-                session.delete(file.paste)
-                session.commit()
+        file = await _run_in_db_pool(_get_live_file, file_id, self._now)
 
-                log.warning(
-                    "FileRaw.get: paste was expired, is your cronjob running?"
-                )
-
-                raise tornado.web.HTTPError(404)
+        if not file:
+            raise tornado.web.HTTPError(404)
 
-            self.set_header("Content-Type", "text/plain; charset=utf-8")
-            self.write(file.raw)
+        self.set_header("Content-Type", "text/plain; charset=utf-8")
+        self.write(file.raw_utf8)
 
 
 class FileHex(Base):
@@ -395,28 +421,25 @@ class FileHex(Base):
     async def get(self, file_id: str) -> None:  # type: ignore
         """Get a file from the database and show it in hex."""
 
-        with manager.DatabaseManager.get_session() as session:
-            file = (
-                session.query(models.File)
-                .filter(models.File.slug == file_id)
-                .first()
-            )
+        file = await _run_in_db_pool(_get_live_file, file_id, self._now)
 
-            if not file:
-                raise tornado.web.HTTPError(404)
+        if not file:
+            raise tornado.web.HTTPError(404)
 
-            if file.paste.exp_date < datetime.now(timezone.utc):
-                session.delete(file.paste)
-                session.commit()
+        raw = memoryview(file.raw_utf8)
 
-                log.warning(
-                    "FileRaw.get: paste was expired, is your cronjob running?"
-                )
+        self.set_header("Content-Type", "text/plain; charset=utf-8")
 
-                raise tornado.web.HTTPError(404)
+        # We know the length up front, this saves the client from having to
+        # deal with a chunked response
+        self.set_header("Content-Length", str(len(raw) * 2))
 
-            self.set_header("Content-Type", "text/plain; charset=utf-8")
-            self.write(binascii.hexlify(file.raw.encode("utf8")))
+        # Hexlify in chunks so we don't keep yet another (double sized) copy
+        # of the file around
+
+        for offset in range(0, len(raw), HEX_CHUNK_SIZE):
+            self.write(binascii.b2a_hex(raw[offset : offset + HEX_CHUNK_SIZE]))
+            await self.flush()
 
 
 class PasteDownload(Base):
@@ -426,44 +449,47 @@ class PasteDownload(Base):
     async def get(self, paste_id: str) -> None:  # type: ignore
         """Get all files from the database and download them as a zipfile."""
 
-        with manager.DatabaseManager.get_session() as session:
-            paste = (
-                session.query(models.Paste)
-                .filter(models.Paste.slug == paste_id)
-                .first()
-            )
-
-            if not paste:
-                raise tornado.web.HTTPError(404)
+        paste = await _run_in_db_pool(_get_live_paste, paste_id, self._now)
 
-            if paste.exp_date < datetime.now(timezone.utc):
-                session.delete(paste)
-                session.commit()
+        if not paste:
+            raise tornado.web.HTTPError(404)
 
-                log.warning(
-                    "FileRaw.get: paste was expired, is your cronjob running?"
-                )
+        self.set_header("Content-Type", "application/zip")
+        self.set_header(
+            "Content-Disposition", f"attachment; filename={paste.slug}.zip"
+        )
 
-                raise tornado.web.HTTPError(404)
+        # Small pastes aren't worth the effort of compressing or streaming,
+        # their archive is sent in one go. Larger ones are compressed at the
+        # fastest level as this happens on the IOLoop
+        small = (
+            sum(len(file.raw_utf8) for file in paste.files)
+            < ARCHIVE_COMPRESS_SIZE
+        )
 
-            data = io.BytesIO()
+        if small:
+            zf = zipfile.ZipFile(_ResponseWriter(self), "w", zipfile.ZIP_STORED)
+        else:
+            zf = zipfile.ZipFile(
+                _ResponseWriter(self),
+                "w",
+                zipfile.ZIP_DEFLATED,
+                compresslevel=1,
+            )
 
-            with zipfile.ZipFile(data, "x") as zf:
-                for file in paste.files:
-                    if file.filename:
-                        filename = f"{utility.filename_clean(file.filename)}-{file.slug}.txt"
-                    else:
-                        filename = f"{file.slug}.txt"
+        with zf:
+            for file in paste.files:
+                if file.filename:
+                    filename = f"{utility.filename_clean(file.filename)}-{file.slug}.txt"
+                else:
+                    filename = f"{file.slug}.txt"
 
-                    zf.writestr(filename, file.raw)
+                zf.writestr(filename, file.raw_utf8)
 
-            data.seek(0)
-
-            self.set_header("Content-Type", "application/zip")
-            self.set_header(
-                "Content-Disposition", f"attachment; filename={paste.slug}.zip"
-            )
-            self.write(data.read())
+                # Send what we have so far to the client instead of holding
+                # the entire archive in memory
+                if not small:
+                    await self.flush()
 
 
 class FileDownload(Base):
@@ -473,39 +499,24 @@ class FileDownload(Base):
     async def get(self, file_id: str) -> None:  # type: ignore
         """Get a file from the database and download it in the plain."""
 
-        with manager.DatabaseManager.get_session() as session:
-            file = (
-                session.query(models.File)
-                .filter(models.File.slug == file_id)
-                .first()
-            )
-
-            if not file:
-                raise tornado.web.HTTPError(404)
-
-            if file.paste.exp_date < datetime.now(timezone.utc):
-                session.delete(file.paste)
-                session.commit()
+        file = await _run_in_db_pool(_get_live_file, file_id, self._now)
 
-                log.warning(
-                    "FileDownload.get: paste was expired, is your cronjob running?"
-                )
-
-                raise tornado.web.HTTPError(404)
-
-            self.set_header("Content-Type", "text/plain; charset=utf-8")
+        if not file:
+            raise tornado.web.HTTPError(404)
 
-            if file.filename:
-                filename = (
-                    f"{utility.filename_clean(file.filename)}-{file.slug}.txt"
-                )
-            else:
-                filename = f"{file.slug}.txt"
+        self.set_header("Content-Type", "text/plain; charset=utf-8")
 
-            self.set_header(
-                "Content-Disposition", f"attachment; filename={filename}"
+        if file.filename:
+            filename = (
+                f"{utility.filename_clean(file.filename)}-{file.slug}.txt"
             )
-            self.write(file.raw)
+        else:
+            filename = f"{file.slug}.txt"
+
+        self.set_header(
+            "Content-Disposition", f"attachment; filename={filename}"
+        )
+        self.write(file.raw_utf8)
 
 
 class Remove(Base):
@@ -516,31 +527,40 @@ class Remove(Base):
         """Look up if the user visiting this page has the removal id for a
         certain paste. If they do they're authorized to remove the paste."""
 
-        with manager.DatabaseManager.get_session() as session:
-            paste = (
-                session.query(models.Paste)
-                .filter(models.Paste.removal == removal)
-                .first()
-            )
+        if not await _run_in_db_pool(_remove_live_paste, removal, self._now):
+            log.info("RemovePaste.get: someone visited with invalid id")
+            raise tornado.web.HTTPError(404)
 
-            if not paste:
-                log.info("RemovePaste.get: someone visited with invalid id")
-                raise tornado.web.HTTPError(404)
+        self.redirect("/")
 
-            if paste.exp_date < datetime.now(timezone.utc):
-                session.delete(paste)
-                session.commit()
 
-                log.warning(
-                    "Remove.get: paste was expired, is your cronjob running?"
-                )
+# Setting up the components and settings of a docutils publisher is a large
+# part of rendering a page so a single publisher is reused. Pages are only
+# rendered on the IOLoop so it is never used concurrently.
+_restructuredtext_parser = docutils.parsers.rst.Parser()
+_restructuredtext_publisher = docutils.core.Publisher(
+    reader=docutils.readers.standalone.Reader(parser=_restructuredtext_parser),
+    parser=_restructuredtext_parser,
+    writer=docutils.writers.html4css1.Writer(),
+    source_class=docutils.io.StringInput,
+    destination_class=docutils.io.StringOutput,
+)
+_restructuredtext_publisher.process_programmatic_settings(None, None, None)
 
-                raise tornado.web.HTTPError(404)
 
-            session.delete(paste)
-            session.commit()
+@functools.lru_cache(maxsize=64)
+def _restructuredtext_html(filename: str, mtime: int) -> str:
+    """Render a RestructuredText file to HTML. Rendering is slow and pages
+    rarely change so the result is cached, the modification time is part of
+    the key so changed files get rendered again."""
 
-        self.redirect("/")
+    with open(filename) as f:
+        _restructuredtext_publisher.set_source(f.read())
+
+    _restructuredtext_publisher.set_destination()
+    _restructuredtext_publisher.publish()
+
+    return str(_restructuredtext_publisher.writer.parts["html_body"])
 
 
 class RestructuredTextPage(Base):
@@ -551,31 +571,50 @@ class RestructuredTextPage(Base):
 
     @defensive.ratelimit(area="read")
     async def get(self) -> None:
+        page = path.page / self.file
+
         try:
-            with open(path.page / self.file) as f:
-                html = docutils.core.publish_parts(
-                    f.read(), writer_name="html"
-                )["html_body"]
+            html = _restructuredtext_html(str(page), page.stat().st_mtime_ns)
         except FileNotFoundError:
             raise tornado.web.HTTPError(404)
 
         self.render(
             "restructuredtextpage.html",
             html=html,
-            pagetitle=(path.page / self.file).stem,
+            pagetitle=page.stem,
         )
 
 
-class Logo(Base):
-    """Render an image file at the logo path."""
+class Logo(tornado.web.StaticFileHandler):
+    """Serve an image file at the logo path. This is a `StaticFileHandler` for
+    a single file so we get conditional requests and caching headers for
+    free."""
 
-    def initialize(self, path: str) -> None:
-        self.path = path
+    @classmethod
+    def get_absolute_path(cls, root: str, path: str) -> str:
+        # The root is the logo itself
+        return os.path.abspath(root)
 
-    async def get(self) -> None:
-        try:
-            with open(self.path, "rb") as f:
-                self.write(f.read())
-                self.set_header("Content-Type", "image/png")
-        except FileNotFoundError:
+    def validate_absolute_path(self, root: str, absolute_path: str) -> str:
+        if not os.path.isfile(absolute_path):
             raise tornado.web.HTTPError(404)
+
+        return absolute_path
+
+    def get_content_type(self) -> str:
+        return "image/png"
+
+    def get_cache_time(
+        self, path: str, modified: Optional[datetime], mime_type: str
+    ) -> int:
+        return 86400
+
+    async def get(self, path: str = "", include_body: bool = True) -> None:
+        await super().get(path, include_body)
+
+    def head(self, path: str = "") -> Awaitable[None]:
+        return super().head(path)
+
+    def write_error(self, status_code: int, **kwargs: Any) -> None:
+        # Render errors such as a missing logo the same way as other pages
+        Base.write_error(self, status_code, **kwargs)  # type: ignore
@@ -1,9 +1,10 @@
+import functools
 import math
 import re
 from base64 import b32encode
 from datetime import datetime, timezone
 from os import urandom
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from pygments.lexers import (
     get_all_lexers,
@@ -17,7 +18,12 @@ from pinnwand.database import manager, models
 log = logger.get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def list_languages() -> Dict[str, str]:
+    """Return a mapping of lexer alias to lexer name for all lexers Pygments
+    knows about, sorted by name. The result is computed once and cached as
+    Pygments' lexers do not change while we are running."""
+
     # Start with converting the pygments lexers index into a dict.
     lexers = {
         lexer[1][0]: lexer[0]
@@ -36,6 +42,14 @@ def list_languages() -> Dict[str, str]:
     return dict(sorted(lexers.items(), key=lambda x: x[1]))  # type: ignore
 
 
+@functools.lru_cache(maxsize=1)
+def available_languages() -> FrozenSet[str]:
+    """The lexer aliases from `list_languages` as a set for cheap membership
+    tests."""
+
+    return frozenset(list_languages())
+
+
 GUESS_LANG_OVERRIDES = {"as3": "yaml", "python2": "python"}
 
 GUESS_LANG_IGNORES = ["mime", "tsql"]
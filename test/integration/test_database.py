@@ -5,3 +5,11 @@ def test_regression_issue_14() -> None:
     # In #14 it was noticed that the tablename for models is calculated
     # incorrectly. This testcase ensures this bug isn't reintroduced
     assert models.Paste.__tablename__ == "paste"
+
+
+def test_indexed_lookups() -> None:
+    # Pastes and files are looked up by these columns on every request
+    assert models.Paste.__table__.c.slug.unique
+    assert models.Paste.__table__.c.removal.unique
+    assert models.File.__table__.c.slug.unique
+    assert models.File.__table__.c.paste_id.index
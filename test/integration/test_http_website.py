@@ -1,12 +1,17 @@
+import asyncio
+import io
+import threading
 import urllib.parse
+import zipfile
 import unittest.mock
 import tornado.testing
 import tornado.web
 import copy
 
 from pinnwand.configuration import Configuration, ConfigurationProvider
-from pinnwand import app
-from pinnwand.database import manager, utils as database_utils
+from pinnwand import app, utility
+from pinnwand.database import manager, models, utils as database_utils
+from pinnwand.handler import website
 
 configuration: Configuration = ConfigurationProvider.get_config()
 
@@ -401,6 +406,225 @@ class WebsiteTestCase(tornado.testing.AsyncHTTPTestCase):
 
         assert response.code == 400
 
+    def test_website_create_post_spam(self) -> None:
+        response = self.fetch(
+            "/create",
+            method="POST",
+            headers={"Cookie": "_xsrf=dummy"},
+            body=urllib.parse.urlencode(
+                {
+                    "_xsrf": "dummy",
+                    "expiry": "1day",
+                    "filename": [""],
+                    "raw": ["https://example.com/" + "spam" * 16],
+                    "lexer": ["text"],
+                },
+                True,
+            ),
+        )
+
+        assert response.code == 451
+        assert b'<h1 id="status-code">451</h1>' in response.body
+
+    def test_website_download_archive(self) -> None:
+        response = self.fetch(
+            "/create",
+            method="POST",
+            headers={"Cookie": "_xsrf=dummy"},
+            body=urllib.parse.urlencode(
+                {
+                    "_xsrf": "dummy",
+                    "expiry": "1day",
+                    "filename": ["a.c", ""],
+                    "raw": ["a", "b"],
+                    "lexer": ["c", "python"],
+                },
+                True,
+            ),
+            follow_redirects=False,
+        )
+
+        paste = response.headers["Location"].split("/")[-1]
+
+        response = self.fetch(
+            f"/download-archive/{paste}",
+            method="GET",
+        )
+        assert response.code == 200
+        assert response.headers["Content-Type"] == "application/zip"
+        assert int(response.headers["Content-Length"]) == len(response.body)
+
+        with zipfile.ZipFile(io.BytesIO(response.body)) as zf:
+            names = zf.namelist()
+
+            assert len(names) == 2
+            assert all(
+                info.compress_type == zipfile.ZIP_STORED
+                for info in zf.infolist()
+            )
+            assert names[0] == f"a-{paste}.txt"
+            assert sorted(zf.read(name) for name in names) == [b"a", b"b"]
+
+    def test_website_download_archive_compressed(self) -> None:
+        raw = "a" * (website.ARCHIVE_COMPRESS_SIZE + 1)
+
+        response = self.fetch(
+            "/create",
+            method="POST",
+            headers={"Cookie": "_xsrf=dummy"},
+            body=urllib.parse.urlencode(
+                {
+                    "_xsrf": "dummy",
+                    "expiry": "1day",
+                    "filename": [""],
+                    "raw": [raw],
+                    "lexer": ["text"],
+                },
+                True,
+            ),
+            follow_redirects=False,
+        )
+
+        paste = response.headers["Location"].split("/")[-1]
+
+        response = self.fetch(
+            f"/download-archive/{paste}",
+            method="GET",
+        )
+        assert response.code == 200
+
+        with zipfile.ZipFile(io.BytesIO(response.body)) as zf:
+            (info,) = zf.infolist()
+
+            assert info.compress_type == zipfile.ZIP_DEFLATED
+            assert zf.read(info) == raw.encode("utf-8")
+
+    def test_website_download_archive_nonexistent_paste(self) -> None:
+        response = self.fetch(
+            f"/download-archive/ABCD",
+            method="GET",
+        )
+        assert response.code == 404
+
+    def test_website_expired_paste(self) -> None:
+        with manager.DatabaseManager.get_session() as session:
+            paste = models.Paste(utility.slug_create(), expiry=-1)
+            paste.files.append(models.File(paste.slug, "a", "text"))
+
+            session.add(paste)
+            session.commit()
+
+            slug = paste.slug
+
+        for url in (
+            f"/{slug}",
+            f"/show/{slug}",
+            f"/repaste/{slug}",
+            f"/raw/{slug}",
+            f"/hex/{slug}",
+            f"/download/{slug}",
+            f"/download-archive/{slug}",
+        ):
+            response = self.fetch(
+                url,
+                method="GET",
+            )
+            assert response.code == 404
+
+    def test_website_remove_deletes_files(self) -> None:
+        with manager.DatabaseManager.get_session() as session:
+            paste = models.Paste(utility.slug_create(), expiry=-1)
+            paste.files.append(models.File(paste.slug, "a", "text"))
+
+            session.add(paste)
+            session.commit()
+
+            expired = paste.removal
+
+            paste = models.Paste(utility.slug_create())
+            paste.files.append(models.File(paste.slug, "a", "text"))
+
+            session.add(paste)
+            session.commit()
+
+            slug, removal = paste.slug, paste.removal
+
+        # Expired pastes are left to be reaped
+        response = self.fetch(
+            f"/remove/{expired}",
+            method="GET",
+        )
+        assert response.code == 404
+
+        response = self.fetch(
+            f"/remove/{removal}",
+            method="GET",
+        )
+        assert response.code == 200
+
+        with manager.DatabaseManager.get_session() as session:
+            assert (
+                session.query(models.Paste).filter_by(removal=expired).count()
+                == 1
+            )
+            assert (
+                session.query(models.Paste).filter_by(removal=removal).count()
+                == 0
+            )
+            assert session.query(models.File).filter_by(slug=slug).count() == 0
+
+    @tornado.testing.gen_test
+    async def test_website_concurrent_show_and_remove(self) -> None:
+        # The default in-memory database has a single connection which can't
+        # be used concurrently, so queries have to stay on the IOLoop.
+        assert manager.DatabaseManager.has_shared_connection()
+        assert (
+            await website._run_in_db_pool(threading.get_ident)
+            == threading.get_ident()
+        )
+
+        with manager.DatabaseManager.get_session() as session:
+            pastes = []
+
+            for _ in range(50):
+                paste = models.Paste(utility.slug_create(auto_scale=False))
+                paste.files.append(models.File(paste.slug, "a", "text"))
+                session.add(paste)
+                pastes.append(paste)
+
+            session.commit()
+
+            slugs = [paste.slug for paste in pastes]
+            removals = [paste.removal for paste in pastes]
+
+        requests = []
+
+        for slug, removal in zip(slugs, removals):
+            requests.append(
+                self.http_client.fetch(
+                    self.get_url(f"/show/{slug}"), raise_error=False
+                )
+            )
+            requests.append(
+                self.http_client.fetch(
+                    self.get_url(f"/remove/{removal}"), raise_error=False
+                )
+            )
+
+        responses = await asyncio.gather(*requests)
+
+        for show, remove in zip(responses[::2], responses[1::2]):
+            assert show.code in (200, 404)
+            assert remove.code == 200
+
+        with manager.DatabaseManager.get_session() as session:
+            assert (
+                session.query(models.Paste)
+                .filter(models.Paste.slug.in_(slugs))
+                .count()
+                == 0
+            )
+
 
 class DeprecatedWebsiteTestCase(tornado.testing.AsyncHTTPTestCase):
     def setUp(self) -> None:
@@ -516,12 +740,14 @@ class DeprecatedWebsiteTestCase(tornado.testing.AsyncHTTPTestCase):
             method="GET",
         )
         assert response.code == 200
+        assert response.body == b"a"
 
         response = self.fetch(
             f"/{paste}/raw",
             method="GET",
         )
         assert response.code == 200
+        assert response.body == b"a"
 
     def test_website_hex(self) -> None:
         response = self.fetch(
@@ -539,12 +765,15 @@ class DeprecatedWebsiteTestCase(tornado.testing.AsyncHTTPTestCase):
             method="GET",
         )
         assert response.code == 200
+        assert response.body == b"61"
+        assert response.headers["Content-Length"] == "2"
 
         response = self.fetch(
             f"/{paste}/hex",
             method="GET",
         )
         assert response.code == 200
+        assert response.body == b"61"
 
     def test_website_remove(self) -> None:
         response = self.fetch(
@@ -716,3 +945,39 @@ class DeprecatedWebsiteTestCase(tornado.testing.AsyncHTTPTestCase):
         )
 
         assert response.code == 200
+
+    def test_website_logo_cached(self) -> None:
+        for url in ("/logo.png", "/favicon.png"):
+            response = self.fetch(
+                url,
+                method="GET",
+            )
+
+            assert response.code == 200
+            assert response.headers["Content-Type"] == "image/png"
+            assert response.headers["Cache-Control"] == "max-age=86400"
+
+            response = self.fetch(
+                url,
+                method="GET",
+                headers={"If-None-Match": response.headers["Etag"]},
+            )
+
+            assert response.code == 304
+
+
+class MissingLogoTestCase(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self) -> tornado.web.Application:
+        with unittest.mock.patch.object(
+            configuration, "_logo_path", "/nonexistent/logo.png"
+        ):
+            return app.make_application()
+
+    def test_website_logo_missing(self) -> None:
+        response = self.fetch(
+            "/logo.png",
+            method="GET",
+        )
+
+        assert response.code == 404
+        assert b"That page does not exist" in response.body
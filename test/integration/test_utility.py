@@ -10,6 +10,11 @@ def test_expiries() -> None:
     assert len(configuration.expiries) == 2
 
 
+def test_available_languages() -> None:
+    assert utility.available_languages() == set(utility.list_languages())
+    assert "autodetect" in utility.available_languages()
+
+
 @pytest.mark.xfail(reason="Pygments incorrectly detects this as `mojo`. Upstream bug to be made.")
 def test_guess_language_broken() -> None:
     # python